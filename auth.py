@@ -1,81 +1,93 @@
 """Authentication module for Instagram CLI Chat."""
-import json
 import sys
 from pathlib import Path
 from instagrapi import Client
 from instagrapi.exceptions import LoginRequired, BadPassword, ChallengeRequired
 from config import Config
-import click
+from output import echo
+from session_store import SessionStore, get_password, set_password
 
 class InstagramAuth:
     """Handle Instagram authentication and session management."""
     
     def __init__(self):
         self.client = Client()
-        self.session_file = Config.SESSION_FILE
+        self.session_store = SessionStore(Config.SESSION_FILE)
         
     def load_session(self):
         """Load existing session if available."""
-        if self.session_file.exists():
-            try:
-                with open(self.session_file, 'r') as f:
-                    session_data = json.load(f)
-                self.client.set_settings(session_data)
-                click.echo("📱 Loaded existing Instagram session")
-                return True
-            except Exception as e:
-                click.echo(f"⚠️  Failed to load session: {e}")
+        try:
+            session_data = self.session_store.load()
+            if session_data is None:
                 return False
-        return False
+            self.client.set_settings(session_data)
+            echo("📱 Loaded existing Instagram session")
+            return True
+        except Exception as e:
+            echo(f"⚠️  Failed to load session: {e}")
+            return False
     
     def save_session(self):
-        """Save current session to file."""
+        """Save current session to file if it changed."""
         try:
-            session_data = self.client.get_settings()
-            with open(self.session_file, 'w') as f:
-                json.dump(session_data, f, indent=2)
-            click.echo("💾 Session saved successfully")
+            if self.session_store.save(self.client.get_settings()):
+                echo("💾 Session saved successfully")
         except Exception as e:
-            click.echo(f"⚠️  Failed to save session: {e}")
+            echo(f"⚠️  Failed to save session: {e}")
+
+    def save_password(self, username, password):
+        """Store the password in the keyring for future logins."""
+        try:
+            backend = set_password(username, password)
+            echo(f"🔑 Password stored in {backend.name}")
+            return True
+        except Exception as e:
+            echo(f"⚠️  Failed to store password: {e}")
+            return False
     
     def login(self, username=None, password=None):
         """Login to Instagram with provided or configured credentials."""
         username = username or Config.INSTAGRAM_USERNAME
         password = password or Config.INSTAGRAM_PASSWORD
+        if username and not password:
+            try:
+                password = get_password(username)
+            except Exception as e:
+                echo(f"⚠️  Failed to read password from keyring: {e}")
         
         if not username or not password:
-            click.echo("❌ Username and password are required")
+            echo("❌ Username and password are required")
             return False
         
         try:
-            click.echo(f"🔐 Logging into Instagram as {username}...")
+            echo(f"🔐 Logging into Instagram as {username}...")
             self.client.login(username, password)
-            click.echo("✅ Successfully logged into Instagram!")
+            echo("✅ Successfully logged into Instagram!")
             self.save_session()
             return True
             
         except BadPassword:
-            click.echo("❌ Invalid username or password")
+            echo("❌ Invalid username or password")
             return False
         except ChallengeRequired as e:
-            click.echo("⚠️  Instagram requires additional verification")
-            click.echo("Please check your Instagram app for security verification")
+            echo("⚠️  Instagram requires additional verification")
+            echo("Please check your Instagram app for security verification")
             return False
         except Exception as e:
-            click.echo(f"❌ Login failed: {e}")
+            echo(f"❌ Login failed: {e}")
             return False
     
     def verify_login(self):
         """Verify that the current session is valid."""
         try:
             user_info = self.client.account_info()
-            click.echo(f"✅ Authenticated as: {user_info.username}")
+            echo(f"✅ Authenticated as: {user_info.username}")
             return True
         except LoginRequired:
-            click.echo("❌ Login required")
+            echo("❌ Login required")
             return False
         except Exception as e:
-            click.echo(f"❌ Authentication verification failed: {e}")
+            echo(f"❌ Authentication verification failed: {e}")
             return False
     
     def authenticate(self):
@@ -85,7 +97,7 @@ class InstagramAuth:
             if self.verify_login():
                 return True
             else:
-                click.echo("🔄 Session expired, logging in again...")
+                echo("🔄 Session expired, logging in again...")
         
         # If no valid session, perform login
         return self.login()
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Benchmark session load/save cost.
+Compares the old indented-JSON session file with SessionStore.
+
+    python bench_session_store.py [--number N]
+"""
+
+import argparse
+import json
+import tempfile
+import timeit
+from pathlib import Path
+from instagrapi import Client
+from session_store import SessionStore
+
+
+def sample_settings():
+    """Build session settings shaped like a logged-in instagrapi client."""
+    settings = Client().get_settings()
+    settings['cookies'] = {f'cookie_{i}': 'x' * 64 for i in range(12)}
+    settings['authorization_data'] = {
+        'ds_user_id': '1234567890',
+        'sessionid': '1234567890%3AabcdefGHIJKL%3A12%3AAYd' + 'z' * 40,
+    }
+    settings['last_login'] = 1700000000.0
+    return settings
+
+
+def report(label, seconds, number):
+    print(f"{label:<34} {seconds / number * 1e6:10.1f} µs/op")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--number', '-n', type=int, default=2000, help='Iterations per measurement')
+    number = parser.parse_args().number
+
+    settings = sample_settings()
+    changed = dict(settings, last_login=settings['last_login'] + 1)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        legacy_file = Path(tmp) / 'legacy_session.json'
+        store = SessionStore(Path(tmp) / 'session.json')
+
+        def legacy_save():
+            with open(legacy_file, 'w') as f:
+                json.dump(settings, f, indent=2)
+
+        def legacy_load():
+            with open(legacy_file, 'r') as f:
+                return json.load(f)
+
+        toggle = [settings, changed]
+
+        def store_save_changed():
+            toggle.reverse()
+            store.save(toggle[0])
+
+        def store_load_cold():
+            store.invalidate()
+            return store.load()
+
+        legacy_save()
+        store.save(settings)
+
+        print(f"Session size: legacy {legacy_file.stat().st_size} bytes, "
+              f"store {store.path.stat().st_size} bytes")
+        report("legacy save (indented json)", timeit.timeit(legacy_save, number=number), number)
+        report("legacy load", timeit.timeit(legacy_load, number=number), number)
+        report("store save, changed (atomic)", timeit.timeit(store_save_changed, number=number), number)
+        store.save(settings)
+        report("store save, unchanged", timeit.timeit(lambda: store.save(settings), number=number), number)
+        report("store load, cold", timeit.timeit(store_load_cold, number=number), number)
+        store.load()
+        report("store load, cached", timeit.timeit(store.load, number=number), number)
+
+
+if __name__ == '__main__':
+    main()
@@ -4,6 +4,7 @@ import click
 from colorama import Fore, Style, init
 from instagrapi.exceptions import ClientError
 from config import Config
+from output import emit, json_mode
 
 # Initialize colorama for cross-platform colored output
 init(autoreset=True)
@@ -14,6 +15,9 @@ class InstagramChat:
     def __init__(self, client):
         self.client = client
         self.current_user = None
+        # Optional callable(action, message) that takes over error reporting,
+        # used by full-screen views that cannot have text printed over them
+        self.on_error = None
         self._get_current_user()
     
     def _get_current_user(self):
@@ -21,73 +25,150 @@ class InstagramChat:
         try:
             self.current_user = self.client.account_info()
         except Exception as e:
-            click.echo(f"❌ Failed to get user info: {e}")
+            self._report_error('get_user_info', e)
     
+    def _report_error(self, action, message):
+        """Report a failure as an 'error' event or as human-readable text."""
+        if self.on_error is not None:
+            self.on_error(action, str(message))
+        elif json_mode():
+            emit('error', action=action, message=str(message))
+        else:
+            click.echo(f"❌ Failed to {action.replace('_', ' ')}: {message}")
+
+    def _normalize_message(self, m):
+        """Convert an instagrapi message into a plain dict.
+
+        The returned dict has keys: 'id', 'timestamp', 'user_id', 'text'.
+        """
+        # Try to derive a stable id; fall back to timestamp+user
+        msg_id = getattr(m, 'id', None) or getattr(m, 'pk', None)
+        if not msg_id:
+            try:
+                msg_id = f"{m.timestamp.timestamp()}_{m.user_id}"
+            except Exception:
+                msg_id = str(id(m))
+
+        # Timestamp to ISO string if available
+        ts = None
+        try:
+            ts = m.timestamp.isoformat() if getattr(m, 'timestamp', None) else None
+        except Exception:
+            ts = None
+
+        text = ''
+        try:
+            if getattr(m, 'text', None):
+                text = m.text
+        except Exception:
+            text = ''
+
+        user_id = getattr(m, 'user_id', None)
+
+        return {
+            'id': str(msg_id),
+            'timestamp': ts,
+            'user_id': user_id,
+            'text': text,
+        }
+
+    def get_conversations(self, limit=20, message_limit=None):
+        """Fetch conversations and return them as a list of dicts.
+
+        Each item has keys: 'index', 'thread_id', 'display_name', 'users',
+        'preview' and 'last_message' (a normalized message dict or None).
+        message_limit caps how many messages are fetched per thread; only the
+        newest one is used here, so callers that poll can pass 1.
+        Returns None if the conversations could not be fetched.
+        """
+        try:
+            threads = self.client.direct_threads(amount=limit, thread_message_limit=message_limit)
+        except Exception as e:
+            self._report_error('list_conversations', e)
+            return None
+
+        conversations = []
+        for i, thread in enumerate(threads[:limit], 1):
+            users = thread.users
+            if not users:
+                continue
+
+            # Handle group chats vs individual chats
+            if len(users) > 1:
+                names = [user.username for user in users]
+                display_name = f"Group: {', '.join(names[:3])}"
+                if len(names) > 3:
+                    display_name += f" (+{len(names)-3} more)"
+            else:
+                display_name = users[0].username
+
+            # Get last message info
+            preview = ""
+            last_message = None
+            if thread.messages:
+                last_msg = thread.messages[0]
+                if hasattr(last_msg, 'text') and last_msg.text:
+                    preview = last_msg.text[:50] + "..." if len(last_msg.text) > 50 else last_msg.text
+                elif hasattr(last_msg, 'media'):
+                    preview = "[Media]"
+                else:
+                    preview = "[Message]"
+                last_message = self._normalize_message(last_msg)
+
+            conversations.append({
+                'index': i,
+                'thread_id': thread.id,
+                'display_name': display_name,
+                'users': users,
+                'preview': preview,
+                'last_message': last_message,
+            })
+
+        return conversations
+
     def list_conversations(self):
         """List all direct message conversations."""
-        try:
-            click.echo(f"\n{Fore.CYAN}📱 Your Instagram Direct Messages:{Style.RESET_ALL}")
-            click.echo("=" * 50)
-            
-            threads = self.client.direct_threads()
-            
-            if not threads:
-                click.echo(f"{Fore.YELLOW}No conversations found{Style.RESET_ALL}")
-                return []
-            
-            conversations = []
-            for i, thread in enumerate(threads[:20], 1):  # Limit to 20 conversations
-                users = thread.users
-                if users:
-                    # Handle group chats vs individual chats
-                    if len(users) > 1:
-                        names = [user.username for user in users]
-                        display_name = f"Group: {', '.join(names[:3])}"
-                        if len(names) > 3:
-                            display_name += f" (+{len(names)-3} more)"
-                    else:
-                        display_name = users[0].username
-                    
-                    # Get last message info
-                    last_message = ""
-                    timestamp = ""
-                    if thread.messages:
-                        last_msg = thread.messages[0]
-                        if hasattr(last_msg, 'text') and last_msg.text:
-                            last_message = last_msg.text[:50] + "..." if len(last_msg.text) > 50 else last_msg.text
-                        elif hasattr(last_msg, 'media'):
-                            last_message = "[Media]"
-                        else:
-                            last_message = "[Message]"
-                        
-                        if hasattr(last_msg, 'timestamp'):
-                            timestamp = last_msg.timestamp.strftime("%m/%d %H:%M")
-                    
-                    click.echo(f"{Fore.GREEN}{i:2d}.{Style.RESET_ALL} {Fore.BLUE}{display_name:<20}{Style.RESET_ALL} "
-                             f"{Fore.WHITE}{last_message:<30}{Style.RESET_ALL} {Fore.YELLOW}{timestamp}{Style.RESET_ALL}")
-                    
-                    conversations.append({
-                        'index': i,
-                        'thread_id': thread.id,
-                        'display_name': display_name,
-                        'users': users
-                    })
-            
+        conversations = self.get_conversations(limit=20)  # Limit to 20 conversations
+        if conversations is None:
+            return []
+
+        if json_mode():
+            for conv in conversations:
+                emit('thread',
+                     index=conv['index'],
+                     thread_id=conv['thread_id'],
+                     display_name=conv['display_name'],
+                     users=[user.username for user in conv['users']],
+                     last_message=conv['last_message'])
             return conversations
-            
-        except Exception as e:
-            click.echo(f"❌ Failed to list conversations: {e}")
+
+        click.echo(f"\n{Fore.CYAN}📱 Your Instagram Direct Messages:{Style.RESET_ALL}")
+        click.echo("=" * 50)
+
+        if not conversations:
+            click.echo(f"{Fore.YELLOW}No conversations found{Style.RESET_ALL}")
             return []
+
+        for conv in conversations:
+            timestamp = ""
+            last_message = conv['last_message']
+            if last_message and last_message['timestamp']:
+                timestamp = datetime.fromisoformat(last_message['timestamp']).strftime("%m/%d %H:%M")
+
+            click.echo(f"{Fore.GREEN}{conv['index']:2d}.{Style.RESET_ALL} {Fore.BLUE}{conv['display_name']:<20}{Style.RESET_ALL} "
+                     f"{Fore.WHITE}{conv['preview']:<30}{Style.RESET_ALL} {Fore.YELLOW}{timestamp}{Style.RESET_ALL}")
+
+        return conversations
     
     def get_messages(self, thread_id, limit=None):
-        """Get messages from a specific conversation."""
+        """Get messages from a specific conversation, or None on failure."""
         try:
             limit = limit or Config.MAX_MESSAGES_DISPLAY
             messages = self.client.direct_messages(thread_id, amount=limit)
             return messages
         except Exception as e:
-            click.echo(f"❌ Failed to get messages: {e}")
-            return []
+            self._report_error('get_messages', e)
+            return None
 
     def fetch_messages(self, thread_id, limit=20):
         """Fetch messages and return a stable, simple list of dicts.
@@ -95,55 +176,36 @@ class InstagramChat:
         The returned list items have keys: 'id', 'timestamp', 'user_id', 'text'.
         This normalizes the instagrapi message objects so polling logic can
         dedupe and print messages without depending on the library types.
+        Returns None if the messages could not be fetched.
         """
         try:
             messages = self.client.direct_messages(thread_id, amount=limit)
-            results = []
-            for m in messages:
-                # Try to derive a stable id; fall back to timestamp+user
-                msg_id = getattr(m, 'id', None) or getattr(m, 'pk', None)
-                if not msg_id:
-                    try:
-                        msg_id = f"{m.timestamp.timestamp()}_{m.user_id}"
-                    except Exception:
-                        msg_id = str(id(m))
-
-                # Timestamp to ISO string if available
-                ts = None
-                try:
-                    ts = m.timestamp.isoformat() if getattr(m, 'timestamp', None) else None
-                except Exception:
-                    ts = None
-
-                text = ''
-                try:
-                    if getattr(m, 'text', None):
-                        text = m.text
-                except Exception:
-                    text = ''
-
-                user_id = getattr(m, 'user_id', None)
-
-                results.append({
-                    'id': str(msg_id),
-                    'timestamp': ts,
-                    'user_id': user_id,
-                    'text': text,
-                })
-
-            return results
+            return [self._normalize_message(m) for m in messages]
         except Exception as e:
-            click.echo(f"❌ Failed to fetch messages: {e}")
-            return []
+            self._report_error('fetch_messages', e)
+            return None
     
     def display_messages(self, thread_id, display_name, limit=None):
-        """Display messages from a conversation."""
+        """Display messages from a conversation.
+
+        Returns the displayed messages as normalized dicts, newest first, or
+        None if they could not be fetched.
+        """
         try:
             messages = self.get_messages(thread_id, limit)
+            if messages is None:
+                return None
+            shown = [self._normalize_message(m) for m in messages]
+
+            if json_mode():
+                # Oldest first, same order as the human-readable view
+                for message in reversed(shown):
+                    emit('message', thread_id=thread_id, **message)
+                return shown
             
             if not messages:
                 click.echo(f"{Fore.YELLOW}No messages found in this conversation{Style.RESET_ALL}")
-                return
+                return shown
             
             click.echo(f"\n{Fore.CYAN}💬 Conversation with {display_name}:{Style.RESET_ALL}")
             click.echo("=" * 60)
@@ -176,12 +238,18 @@ class InstagramChat:
                     click.echo(f"⚠️  Error displaying message: {e}")
             
             click.echo("=" * 60)
+            return shown
             
         except Exception as e:
-            click.echo(f"❌ Failed to display messages: {e}")
+            self._report_error('display_messages', e)
+            return None
     
     def send_message(self, username_or_thread_id, message_text):
-        """Send a direct message to a user or thread."""
+        """Send a direct message to a user or thread.
+
+        In JSON mode a single 'send' event is emitted with the outcome.
+        """
+        error = None
         try:
             # If it's a thread ID (numeric), send to thread
             if str(username_or_thread_id).isdigit():
@@ -193,27 +261,38 @@ class InstagramChat:
                 user_id = self.client.user_id_from_username(username)
                 result = self.client.direct_send(message_text, [user_id])
             
-            if result:
-                click.echo(f"{Fore.GREEN}✅ Message sent successfully!{Style.RESET_ALL}")
-                return True
-            else:
-                click.echo(f"{Fore.RED}❌ Failed to send message{Style.RESET_ALL}")
-                return False
+            if not result:
+                error = "Failed to send message"
                 
         except ClientError as e:
             if "User not found" in str(e):
-                click.echo(f"{Fore.RED}❌ User '{username_or_thread_id}' not found{Style.RESET_ALL}")
+                error = f"User '{username_or_thread_id}' not found"
             else:
-                click.echo(f"{Fore.RED}❌ Failed to send message: {e}{Style.RESET_ALL}")
-            return False
+                error = f"Failed to send message: {e}"
         except Exception as e:
-            click.echo(f"{Fore.RED}❌ Failed to send message: {e}{Style.RESET_ALL}")
-            return False
+            error = f"Failed to send message: {e}"
+
+        if json_mode():
+            fields = {'target': str(username_or_thread_id), 'text': message_text, 'ok': error is None}
+            if error:
+                fields['error'] = error
+            emit('send', **fields)
+        elif error:
+            click.echo(f"{Fore.RED}❌ {error}{Style.RESET_ALL}")
+        else:
+            click.echo(f"{Fore.GREEN}✅ Message sent successfully!{Style.RESET_ALL}")
+        return error is None
     
     def search_users(self, query):
         """Search for users by username."""
         try:
             users = self.client.search_users(query)
+
+            if json_mode():
+                for user in users[:10]:
+                    emit('user', user_id=str(user.pk), username=user.username, full_name=user.full_name)
+                return users[:10]
+
             if not users:
                 click.echo(f"{Fore.YELLOW}No users found for '{query}'{Style.RESET_ALL}")
                 return []
@@ -228,5 +307,5 @@ class InstagramChat:
             return users[:10]
             
         except Exception as e:
-            click.echo(f"❌ Failed to search users: {e}")
+            self._report_error('search_users', e)
             return []
\ No newline at end of file
@@ -15,10 +15,21 @@ class Config:
     
     # Session file location
     SESSION_FILE = Path.home() / '.instagram_chat_session.json'
+
+    # Credential storage: 'auto' uses the system keyring when available and
+    # falls back to KEYRING_FILE; 'file' always uses KEYRING_FILE
+    CREDENTIAL_STORE = os.getenv('CREDENTIAL_STORE', 'auto')
+    KEYRING_FILE = Path(os.getenv('KEYRING_FILE', Path.home() / '.instagram_chat_keyring.json'))
     
     # App settings
     MAX_MESSAGES_DISPLAY = int(os.getenv('MAX_MESSAGES_DISPLAY', '10'))
     POLLING_INTERVAL = int(os.getenv('POLLING_INTERVAL', '5'))  # seconds
+    INBOX_SIZE = int(os.getenv('INBOX_SIZE', '50'))  # conversations tracked by 'inbox'
+
+    # Message hook settings
+    HOOK_WORKERS = int(os.getenv('HOOK_WORKERS', '2'))
+    HOOK_QUEUE_SIZE = int(os.getenv('HOOK_QUEUE_SIZE', '100'))
+    HOOK_TIMEOUT = float(os.getenv('HOOK_TIMEOUT', '10'))  # seconds
     
     @classmethod
     def validate(cls):
@@ -26,6 +37,9 @@ class Config:
         if not cls.INSTAGRAM_USERNAME:
             raise ValueError("INSTAGRAM_USERNAME environment variable is required")
         if not cls.INSTAGRAM_PASSWORD:
-            raise ValueError("INSTAGRAM_PASSWORD environment variable is required")
+            # Imported here because session_store depends on Config
+            from session_store import get_password
+            if not get_password(cls.INSTAGRAM_USERNAME):
+                raise ValueError("No password found in INSTAGRAM_PASSWORD or the keyring; run 'setup' or 'login'")
         
         return True
\ No newline at end of file
@@ -10,7 +10,7 @@ ENV_EXAMPLE = """
 # Create a .env file with these settings and your actual credentials
 
 INSTAGRAM_USERNAME=your_instagram_username
-INSTAGRAM_PASSWORD=your_instagram_password
+# The password is stored in your system keyring by 'setup' or 'login'
 
 # Optional settings
 MAX_MESSAGES_DISPLAY=10
@@ -84,7 +84,7 @@ FEATURES:
 
 SECURITY NOTES:
 ==============
-- Your credentials are stored locally in .env file
+- Your username is stored in .env, your password in the system keyring
 - Session data is saved securely on your machine
 - No data is sent to third parties
 - Always keep your .env file private and secure
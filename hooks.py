@@ -0,0 +1,256 @@
+"""Incoming-message hook pipeline for Instagram CLI Chat.
+
+Hooks react to new messages seen by the chat poller (auto-replies,
+forwarding, keyword alerts, ...). A hook is either a Python callable that
+receives the normalized message dict, or an external command that receives
+the message as a single JSON line on stdin.
+
+Hooks run on a small pool of worker threads fed by a bounded queue, so a
+slow hook never delays polling or user input. Each hook gets an equal share
+of the queue; when its share is full its new jobs are dropped (and counted)
+instead of blocking the poller or crowding out other hooks.
+"""
+import importlib
+import queue
+import shlex
+import subprocess
+import threading
+import time
+from config import Config
+from serializer import dumps
+
+
+class HookBusy(Exception):
+    """Raised when no handler slot is free because earlier calls overran."""
+
+
+class Hook:
+    """A single registered hook and its metrics."""
+
+    def __init__(self, name, run, slots=None):
+        self.name = name
+        self.run = run
+        # Caps this hook's handler threads, including abandoned ones
+        self.slots = slots
+        self.pending = 0
+        self.calls = 0
+        self.errors = 0
+        self.timeouts = 0
+        self.dropped = 0
+        self.total_latency = 0.0
+        self.max_latency = 0.0
+        self.last_error = None
+
+    def record(self, latency, error=None, timed_out=False):
+        """Record the outcome of one invocation."""
+        self.calls += 1
+        self.total_latency += latency
+        self.max_latency = max(self.max_latency, latency)
+        if timed_out:
+            self.timeouts += 1
+        elif error is not None:
+            self.errors += 1
+        if error is not None:
+            self.last_error = str(error)
+
+
+def load_handler(spec):
+    """Import a Python handler given as 'module:function'."""
+    module_name, sep, attr = spec.partition(':')
+    if not sep or not module_name or not attr:
+        raise ValueError(f"Invalid hook '{spec}', expected 'module:function'")
+    handler = getattr(importlib.import_module(module_name), attr)
+    if not callable(handler):
+        raise ValueError(f"Hook '{spec}' is not callable")
+    return handler
+
+
+class HookPipeline:
+    """Dispatch new messages to registered hooks on a bounded worker pool."""
+
+    def __init__(self, workers=None, queue_size=None, timeout=None):
+        self.workers = workers or Config.HOOK_WORKERS
+        self.timeout = timeout or Config.HOOK_TIMEOUT
+        self.hooks = []
+        self._queue = queue.Queue(maxsize=queue_size or Config.HOOK_QUEUE_SIZE)
+        # Overall cap on threads running Python handlers, sized in start()
+        self._handler_slots = None
+        self._threads = []
+        self._lock = threading.Lock()
+        self._submitted = 0
+        self._dropped = 0
+        self._max_depth = 0
+        self._total_wait = 0.0
+        self._started = 0
+
+    def register(self, handler, name=None):
+        """Register a Python callable that receives each new message dict."""
+        hook = Hook(name or getattr(handler, '__name__', repr(handler)), None,
+                    slots=threading.BoundedSemaphore(self.workers))
+        hook.run = lambda message: self._run_handler(hook, handler, message)
+        self.hooks.append(hook)
+        return hook
+
+    def register_command(self, command, name=None):
+        """Register an external command that reads the message as JSON on stdin."""
+        args = shlex.split(command)
+        if not args:
+            raise ValueError("Hook command must not be empty")
+        hook = Hook(name or command, lambda message: self._run_command(args, message))
+        self.hooks.append(hook)
+        return hook
+
+    def start(self):
+        """Start the worker threads."""
+        if self._threads or not self.hooks:
+            return
+        # Room for at least one pending job per hook, so every hook gets a share
+        self._queue = queue.Queue(maxsize=max(self._queue.maxsize, len(self.hooks)))
+        python_hooks = sum(1 for hook in self.hooks if hook.slots is not None)
+        self._handler_slots = threading.BoundedSemaphore(max(1, self.workers * python_hooks))
+        for i in range(self.workers):
+            worker = threading.Thread(target=self._worker, name=f"hook-worker-{i}")
+            worker.daemon = True
+            worker.start()
+            self._threads.append(worker)
+
+    def stop(self, timeout=1):
+        """Stop the worker threads, waiting briefly for in-flight hooks."""
+        for _ in self._threads:
+            try:
+                self._queue.put_nowait(None)
+            except queue.Full:
+                break
+        deadline = time.monotonic() + timeout
+        for worker in self._threads:
+            worker.join(timeout=max(0, deadline - time.monotonic()))
+        self._threads = []
+
+    def submit(self, message):
+        """Queue a message for every hook without blocking.
+
+        Each hook may have at most its share of the queue pending, so a hook
+        that falls behind only drops its own jobs. Returns the number of hook
+        jobs that were dropped.
+        """
+        if not self.hooks:
+            return 0
+        dropped = 0
+        now = time.monotonic()
+        share = self._queue.maxsize // len(self.hooks)
+        with self._lock:
+            for hook in self.hooks:
+                if hook.pending >= share:
+                    hook.dropped += 1
+                    dropped += 1
+                    continue
+                try:
+                    self._queue.put_nowait((hook, message, now))
+                except queue.Full:
+                    hook.dropped += 1
+                    dropped += 1
+                    continue
+                hook.pending += 1
+            self._submitted += len(self.hooks) - dropped
+            self._dropped += dropped
+            self._max_depth = max(self._max_depth, self._queue.qsize())
+        return dropped
+
+    def metrics(self):
+        """Return a snapshot of pipeline and per-hook metrics."""
+        with self._lock:
+            started = self._started
+            snapshot = {
+                'queue_depth': self._queue.qsize(),
+                'max_queue_depth': self._max_depth,
+                'submitted': self._submitted,
+                'dropped': self._dropped,
+                'avg_wait_ms': round(self._total_wait / started * 1000, 2) if started else 0.0,
+                'hooks': [{
+                    'name': hook.name,
+                    'calls': hook.calls,
+                    'errors': hook.errors,
+                    'timeouts': hook.timeouts,
+                    'dropped': hook.dropped,
+                    'avg_latency_ms': round(hook.total_latency / hook.calls * 1000, 2) if hook.calls else 0.0,
+                    'max_latency_ms': round(hook.max_latency * 1000, 2),
+                    'last_error': hook.last_error,
+                } for hook in self.hooks],
+            }
+        return snapshot
+
+    def _worker(self):
+        while True:
+            job = self._queue.get()
+            if job is None:
+                return
+            hook, message, enqueued_at = job
+            started = time.monotonic()
+            with self._lock:
+                hook.pending -= 1
+                self._started += 1
+                self._total_wait += started - enqueued_at
+            error = None
+            timed_out = False
+            try:
+                hook.run(message)
+            except HookBusy:
+                with self._lock:
+                    self._dropped += 1
+                    hook.dropped += 1
+                continue
+            except subprocess.TimeoutExpired as e:
+                error, timed_out = e, True
+            except TimeoutError as e:
+                error, timed_out = e, True
+            except Exception as e:
+                error = e
+            with self._lock:
+                hook.record(time.monotonic() - started, error, timed_out)
+
+    def _run_handler(self, hook, handler, message):
+        """Run a Python handler, giving up on it after the hook timeout.
+
+        Python threads cannot be killed, so a handler that overruns keeps
+        running in the background but no longer occupies a worker. It does
+        keep one of its hook's slots until it finishes; once all of them are
+        held, that hook's new calls are dropped instead of starting more
+        threads, while other hooks keep running.
+        """
+        if not hook.slots.acquire(blocking=False):
+            raise HookBusy("All handler slots for this hook are busy")
+        if not self._handler_slots.acquire(blocking=False):
+            hook.slots.release()
+            raise HookBusy("All handler slots are busy")
+        outcome = {}
+
+        def target():
+            try:
+                handler(dict(message))
+            except Exception as e:
+                outcome['error'] = e
+            finally:
+                self._handler_slots.release()
+                hook.slots.release()
+
+        runner = threading.Thread(target=target, name="hook-handler")
+        runner.daemon = True
+        runner.start()
+        runner.join(self.timeout)
+        if runner.is_alive():
+            raise TimeoutError(f"Hook timed out after {self.timeout}s")
+        if 'error' in outcome:
+            raise outcome['error']
+
+    def _run_command(self, args, message):
+        """Run an external command with the message as JSON on stdin."""
+        result = subprocess.run(
+            args,
+            input=dumps(message) + b'\n',
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
+            timeout=self.timeout,
+        )
+        if result.returncode != 0:
+            stderr = result.stderr.decode('utf-8', 'replace').strip()
+            raise RuntimeError(f"exit status {result.returncode}" + (f": {stderr}" if stderr else ""))
@@ -0,0 +1,322 @@
+"""Live full-screen inbox view for Instagram CLI Chat.
+
+The view keeps its own copy of the inbox (previews, timestamps and unread
+counts) and only does extra work for threads whose newest message changed
+since the last refresh: unread counts are fetched for those threads alone,
+their rows are re-formatted, and only screen lines that differ from the
+previous frame are rewritten.
+"""
+import shutil
+import threading
+from datetime import datetime
+import click
+from colorama import Fore, Style
+from config import Config
+
+# ANSI control sequences (colorama translates the cursor ones on Windows)
+ENTER_SCREEN = '\033[?1049h\033[?25l'
+LEAVE_SCREEN = '\033[?25h\033[?1049l'
+SHOW_CURSOR = '\033[?25h'
+HIDE_CURSOR = '\033[?25l'
+CLEAR_SCREEN = '\033[2J\033[H'
+
+KEYS_UP = ('k', '\x1b[A', '\xe0H')
+KEYS_DOWN = ('j', '\x1b[B', '\xe0P')
+KEYS_OPEN = ('\r', '\n')
+KEYS_REFRESH = ('r',)
+KEYS_QUIT = ('q', '\x1b')
+
+# How many recent messages to inspect when counting unread messages
+UNREAD_LOOKBACK = 20
+
+
+class InboxState:
+    """Locally tracked inbox rows with previews and unread counts."""
+
+    def __init__(self, chat):
+        self.chat = chat
+        # thread_id -> row dict; rows outside the current window are kept so
+        # their unread counts survive until the thread shows up again
+        self.rows = {}
+        self.order = []  # thread ids in the window, most recent activity first
+        # False until the first refresh has been applied; threads seen then
+        # are existing history rather than new activity
+        self.primed = False
+
+    def diff(self, conversations):
+        """Return (conversation, new_unread) pairs for threads that changed.
+
+        Only threads whose newest message differs from the stored one are
+        returned, and only those threads have their messages fetched.
+        """
+        my_pk = self.chat.current_user.pk if self.chat.current_user else None
+        changes = []
+        for conv in conversations:
+            last = conv['last_message']
+            last_id = last['id'] if last else None
+            row = self.rows.get(conv['thread_id'])
+            if row is None:
+                new_unread = 0
+                if self.primed and last and last['user_id'] != my_pk:
+                    new_unread = self._count_new(conv['thread_id'], None, my_pk)
+                changes.append((conv, new_unread))
+            elif row['last_id'] != last_id:
+                new_unread = 0
+                if last and last['user_id'] != my_pk:
+                    new_unread = self._count_new(conv['thread_id'], row['last_id'], my_pk)
+                changes.append((conv, new_unread))
+        return changes
+
+    def apply(self, conversations, changes):
+        """Merge changed threads into the state; return their thread ids."""
+        changed = set()
+        for conv, new_unread in changes:
+            thread_id = conv['thread_id']
+            last = conv['last_message']
+            timestamp = ""
+            if last and last['timestamp']:
+                timestamp = datetime.fromisoformat(last['timestamp']).strftime("%m/%d %H:%M")
+            row = self.rows.setdefault(thread_id, {'thread_id': thread_id, 'unread': 0})
+            row.update(
+                display_name=conv['display_name'],
+                preview=conv['preview'],
+                timestamp=timestamp,
+                last_id=last['id'] if last else None,
+            )
+            row['unread'] += new_unread
+            changed.add(thread_id)
+
+        self.order = [conv['thread_id'] for conv in conversations]
+        self.primed = True
+        return changed
+
+    def mark_read(self, thread_id):
+        """Reset the unread count of a thread; return True if it changed."""
+        row = self.rows.get(thread_id)
+        if row and row['unread']:
+            row['unread'] = 0
+            return True
+        return False
+
+    def _count_new(self, thread_id, known_id, my_pk):
+        """Count messages from others since known_id or since my last reply.
+
+        known_id is None for a thread that was not tracked yet.
+        """
+        count = 0
+        for m in self.chat.fetch_messages(thread_id, limit=UNREAD_LOOKBACK) or []:
+            if m['id'] == known_id or m['user_id'] == my_pk:
+                break
+            if m['user_id'] != my_pk:
+                count += 1
+        # The newest message is from someone else, so at least one is unread
+        return count or 1
+
+
+class ScreenRenderer:
+    """Write only the screen lines that differ from the previous frame."""
+
+    def __init__(self):
+        self.lines = None
+
+    def invalidate(self):
+        """Force the next draw to clear and repaint the whole screen."""
+        self.lines = None
+
+    def draw(self, lines):
+        out = []
+        previous = self.lines
+        if previous is None:
+            out.append(CLEAR_SCREEN)
+            previous = []
+        for i, line in enumerate(lines):
+            if i >= len(previous) or previous[i] != line:
+                out.append(f"\033[{i + 1};1H{line}\033[K")
+        for i in range(len(lines), len(previous)):
+            out.append(f"\033[{i + 1};1H\033[K")
+        self.lines = list(lines)
+        if out:
+            click.echo(''.join(out), nl=False)
+
+
+class InboxDashboard:
+    """Interactive inbox that refreshes in place until the user quits."""
+
+    def __init__(self, chat, limit=None, refresh_interval=None):
+        self.chat = chat
+        self.limit = limit or Config.INBOX_SIZE
+        self.refresh_interval = refresh_interval or Config.POLLING_INTERVAL
+        self.state = InboxState(chat)
+        self.renderer = ScreenRenderer()
+        self.selected = None
+        self.status = ""
+        self._top = 0
+        self._width = None
+        self._row_cache = {}  # thread_id -> formatted row, minus the marker
+        self._errors = []
+        self._lock = threading.RLock()
+        self._refresh_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._paused = False
+
+    def run(self):
+        """Show the dashboard and handle keys until the user quits."""
+        self.chat.on_error = self._on_error
+        click.echo(ENTER_SCREEN, nl=False)
+        try:
+            self.refresh()
+            refresher = threading.Thread(target=self._auto_refresh)
+            refresher.daemon = True
+            refresher.start()
+
+            while True:
+                key = click.getchar()
+                if key in KEYS_QUIT:
+                    break
+                elif key in KEYS_UP:
+                    self.move(-1)
+                elif key in KEYS_DOWN:
+                    self.move(1)
+                elif key in KEYS_REFRESH:
+                    self.refresh()
+                elif key in KEYS_OPEN:
+                    self.open_selected()
+        except (KeyboardInterrupt, EOFError):
+            pass
+        finally:
+            self._stop.set()
+            self.chat.on_error = None
+            click.echo(LEAVE_SCREEN, nl=False)
+
+    def refresh(self):
+        """Fetch the inbox and redraw whatever changed.
+
+        Network calls happen outside the display lock so key handling stays
+        responsive while a refresh is in flight.
+        """
+        with self._refresh_lock:
+            self._errors = []
+            conversations = self.chat.get_conversations(limit=self.limit, message_limit=1)
+            if conversations is None:
+                # Keep showing the last known inbox rather than an empty one
+                self.draw()
+                return
+            changes = self.state.diff(conversations)
+
+            with self._lock:
+                for thread_id in self.state.apply(conversations, changes):
+                    self._row_cache.pop(thread_id, None)
+                if self.selected not in self.state.order:
+                    self.selected = self.state.order[0] if self.state.order else None
+                if not self._errors:
+                    self.status = f"Updated {datetime.now():%H:%M:%S}"
+        self.draw()
+
+    def move(self, step):
+        """Move the selection up or down."""
+        with self._lock:
+            order = self.state.order
+            if not order:
+                return
+            i = order.index(self.selected) if self.selected in order else 0
+            self.selected = order[max(0, min(len(order) - 1, i + step))]
+        self.draw()
+
+    def open_selected(self):
+        """Show the selected thread in place and optionally reply to it.
+
+        Holds the refresh lock while the thread is shown, so no refresh is
+        running when error reporting is switched back to plain output.
+        """
+        with self._refresh_lock:
+            with self._lock:
+                row = self.state.rows.get(self.selected)
+                if row is None:
+                    return
+                self._paused = True
+                self.chat.on_error = None
+            click.echo(CLEAR_SCREEN + SHOW_CURSOR, nl=False)
+            try:
+                self.chat.display_messages(row['thread_id'], row['display_name'])
+                reply = click.prompt('Reply (Enter to go back)', default='', show_default=False)
+                if reply.strip():
+                    self.chat.send_message(row['thread_id'], reply)
+            except (click.Abort, EOFError):
+                pass
+            finally:
+                with self._lock:
+                    self.chat.on_error = self._on_error
+                    if self.state.mark_read(row['thread_id']):
+                        self._row_cache.pop(row['thread_id'], None)
+                    self.renderer.invalidate()
+                    self._paused = False
+                click.echo(HIDE_CURSOR, nl=False)
+                self.draw()
+
+    def draw(self):
+        """Render the current state, writing only changed lines."""
+        with self._lock:
+            if not self._paused:
+                self.renderer.draw(self._frame())
+
+    def _auto_refresh(self):
+        while not self._stop.wait(self.refresh_interval):
+            if not self._paused:
+                self.refresh()
+
+    def _on_error(self, action, message):
+        self._errors.append(message)
+        self.status = f"Failed to {action.replace('_', ' ')}: {message}"
+
+    def _frame(self):
+        """Build the lines of the current frame."""
+        size = shutil.get_terminal_size()
+        width = size.columns
+        if width != self._width:
+            self._row_cache.clear()
+            self._width = width
+
+        order = self.state.order
+        rows = self.state.rows
+        unread = sum(rows[thread_id]['unread'] for thread_id in order)
+        lines = [
+            f"{Fore.CYAN}📱 Inbox: {len(order)} conversations, {unread} unread{Style.RESET_ALL}",
+            "=" * min(width, 60),
+        ]
+
+        # Scroll so the selected row stays visible
+        visible = max(1, size.lines - 4)
+        if self.selected in order:
+            i = order.index(self.selected)
+            if i < self._top:
+                self._top = i
+            elif i >= self._top + visible:
+                self._top = i - visible + 1
+        self._top = max(0, min(self._top, max(0, len(order) - visible)))
+
+        for thread_id in order[self._top:self._top + visible]:
+            body = self._row_cache.get(thread_id)
+            if body is None:
+                body = self._row_cache[thread_id] = self._format_row(rows[thread_id], width)
+            marker = f"{Fore.GREEN}>{Style.RESET_ALL}" if thread_id == self.selected else " "
+            lines.append(f"{marker} {body}")
+        if not order:
+            lines.append(f"{Fore.YELLOW}No conversations found{Style.RESET_ALL}")
+
+        footer = f"↑/↓ select · Enter open · r refresh · q quit   {self.status}"
+        lines.append("")
+        lines.append(f"{Fore.GREEN}{footer[:width - 1]}{Style.RESET_ALL}")
+        return lines
+
+    def _format_row(self, row, width):
+        """Format a row to fit the terminal width."""
+        # marker + spaces + name(20) + unread(5) + timestamp(11) = 42 columns
+        preview_width = max(10, width - 43)
+        name = row['display_name'][:20]
+        badge = f"({row['unread']})" if row['unread'] else ""
+        preview = row['preview'].replace('\n', ' ')[:preview_width]
+        name_style = Style.BRIGHT if row['unread'] else ""
+        return (f"{Fore.BLUE}{name_style}{name:<20}{Style.RESET_ALL} "
+                f"{Fore.YELLOW}{badge:>5}{Style.RESET_ALL} "
+                f"{Fore.WHITE}{preview:<{preview_width}}{Style.RESET_ALL} "
+                f"{Fore.YELLOW}{row['timestamp']:>11}{Style.RESET_ALL}")
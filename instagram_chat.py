@@ -12,6 +12,9 @@ from colorama import Fore, Style, init
 from auth import InstagramAuth
 from chat import InstagramChat
 from config import Config
+from hooks import HookPipeline, load_handler
+from inbox import InboxDashboard
+from output import echo, emit, json_mode, set_json_mode
 
 # Initialize colorama for cross-platform colored output
 init(autoreset=True)
@@ -26,11 +29,23 @@ def print_banner():
     """
     click.echo(banner)
 
+def auth_failed():
+    """Report a failed authentication and exit."""
+    if json_mode():
+        emit('error', action='authenticate', message="Authentication failed. Please run 'login' command first.")
+    else:
+        click.echo(f"{Fore.RED}❌ Authentication failed. Please run 'login' command first.{Style.RESET_ALL}")
+    sys.exit(1)
+
 @click.group()
 @click.version_option(version="1.0.0")
-def cli():
+@click.option('--json', 'json_output', is_flag=True,
+              help='Emit machine-readable NDJSON events (one per line) instead of colored text')
+def cli(json_output):
     """Instagram Command Line Chat - Send and receive Instagram DMs from your terminal."""
-    print_banner()
+    set_json_mode(json_output)
+    if not json_output:
+        print_banner()
 
 @cli.command()
 @click.option('--username', '-u', help='Instagram username')
@@ -41,14 +56,21 @@ def login(username, password):
     
     # Use provided credentials or prompt for them
     if not username:
-        username = click.prompt('Instagram username')
+        username = click.prompt('Instagram username', err=json_mode())
     if not password:
-        password = click.prompt('Instagram password', hide_input=True)
+        password = click.prompt('Instagram password', hide_input=True, err=json_mode())
     
     if auth.login(username, password):
-        click.echo(f"{Fore.GREEN}✅ Successfully logged in and session saved!{Style.RESET_ALL}")
+        auth.save_password(username, password)
+        if json_mode():
+            emit('login', username=username, ok=True)
+        else:
+            click.echo(f"{Fore.GREEN}✅ Successfully logged in and session saved!{Style.RESET_ALL}")
     else:
-        click.echo(f"{Fore.RED}❌ Login failed{Style.RESET_ALL}")
+        if json_mode():
+            emit('login', username=username, ok=False)
+        else:
+            click.echo(f"{Fore.RED}❌ Login failed{Style.RESET_ALL}")
         sys.exit(1)
 
 @cli.command()
@@ -57,29 +79,74 @@ def conversations():
     auth = InstagramAuth()
     
     if not auth.authenticate():
-        click.echo(f"{Fore.RED}❌ Authentication failed. Please run 'login' command first.{Style.RESET_ALL}")
-        sys.exit(1)
+        auth_failed()
     
     chat = InstagramChat(auth.get_client())
     conversations = chat.list_conversations()
     
-    if conversations:
+    if conversations and not json_mode():
         click.echo(f"\n{Fore.GREEN}💡 Use 'chat <number>' to open a conversation{Style.RESET_ALL}")
         click.echo(f"{Fore.GREEN}💡 Use 'send <username> <message>' to send a new message{Style.RESET_ALL}")
 
+@cli.command()
+@click.option('--limit', '-l', default=Config.INBOX_SIZE, help='Number of conversations to track')
+def inbox(limit):
+    """Live inbox view with unread counts. Refreshes in place until you quit."""
+    if json_mode():
+        emit('error', action='inbox', message="The inbox view is interactive and does not support --json")
+        sys.exit(1)
+    if not sys.stdin.isatty() or not sys.stdout.isatty():
+        click.echo(f"{Fore.RED}❌ The inbox view needs an interactive terminal{Style.RESET_ALL}")
+        sys.exit(1)
+
+    auth = InstagramAuth()
+    
+    if not auth.authenticate():
+        auth_failed()
+    
+    chat = InstagramChat(auth.get_client())
+    InboxDashboard(chat, limit=limit).run()
+
+def print_hook_metrics(metrics):
+    """Print a summary of hook pipeline metrics."""
+    if json_mode():
+        emit('hook_metrics', **metrics)
+        return
+    click.echo(f"\n{Fore.CYAN}🪝 Hooks: {metrics['submitted']} queued, {metrics['dropped']} dropped, "
+               f"max queue depth {metrics['max_queue_depth']}, avg wait {metrics['avg_wait_ms']}ms{Style.RESET_ALL}")
+    for hook in metrics['hooks']:
+        click.echo(f"   {hook['name']}: {hook['calls']} calls, {hook['errors']} errors, {hook['timeouts']} timeouts, "
+                   f"{hook['dropped']} dropped, avg {hook['avg_latency_ms']}ms, max {hook['max_latency_ms']}ms")
+
 @cli.command(name='chat')
 @click.argument('conversation_id', type=int)
 @click.option('--limit', '-l', default=10, help='Number of messages to display')
-def chat_cmd(conversation_id, limit):
+@click.option('--hook', 'hook_specs', multiple=True, metavar='MODULE:FUNCTION',
+              help='Python function to call with each new message (repeatable)')
+@click.option('--hook-cmd', 'hook_cmds', multiple=True, metavar='COMMAND',
+              help='Command to run with each new message as JSON on stdin (repeatable)')
+def chat_cmd(conversation_id, limit, hook_specs, hook_cmds):
     """View messages in a specific conversation. Use the number from 'conversations' command."""
+    pipeline = HookPipeline()
+    try:
+        for spec in hook_specs:
+            pipeline.register(load_handler(spec), name=spec)
+        for command in hook_cmds:
+            pipeline.register_command(command)
+    except (ImportError, AttributeError, ValueError) as e:
+        if json_mode():
+            emit('error', action='load_hook', message=str(e))
+        else:
+            click.echo(f"{Fore.RED}❌ Failed to load hook: {e}{Style.RESET_ALL}")
+        sys.exit(1)
+
     auth = InstagramAuth()
     
     if not auth.authenticate():
-        click.echo(f"{Fore.RED}❌ Authentication failed. Please run 'login' command first.{Style.RESET_ALL}")
-        sys.exit(1)
+        auth_failed()
     
     chat = InstagramChat(auth.get_client())
-    conversations = chat.list_conversations()
+    conversations = chat.get_conversations() or []
     
     # Find the conversation
     selected_conv = None
@@ -89,10 +156,13 @@ def chat_cmd(conversation_id, limit):
             break
     
     if not selected_conv:
-        click.echo(f"{Fore.RED}❌ Conversation {conversation_id} not found{Style.RESET_ALL}")
+        if json_mode():
+            emit('error', action='chat', message=f"Conversation {conversation_id} not found")
+        else:
+            click.echo(f"{Fore.RED}❌ Conversation {conversation_id} not found{Style.RESET_ALL}")
         return
     
-    chat.display_messages(
+    history = chat.display_messages(
         selected_conv['thread_id'], 
         selected_conv['display_name'], 
         limit
@@ -102,10 +172,18 @@ def chat_cmd(conversation_id, limit):
     stop_event = threading.Event()
 
     def poll_thread_messages(thread_id, chat_obj, stop_evt, poll_interval=Config.POLLING_INTERVAL):
-        last_seen = None
+        # Start after the newest message already shown so history isn't repeated
+        last_seen = history[0]['id'] if history else None
+        # Once the history is known, every message the poller finds is new and
+        # goes to hooks. If it could not be fetched, the first successful poll
+        # stands in for it and is only displayed.
+        primed = history is not None
         while not stop_evt.is_set():
             try:
                 messages = chat_obj.fetch_messages(thread_id, limit=20)
+                if messages is None:
+                    time.sleep(poll_interval)
+                    continue
                 # messages returned newest-first; reverse to process oldest->newest
                 new = []
                 for m in reversed(messages):
@@ -113,30 +191,41 @@ def chat_cmd(conversation_id, limit):
                         new.append(m)
                 if new:
                     for m in new:
+                        if primed and pipeline.hooks:
+                            is_me = chat_obj.current_user is not None and m.get('user_id') == chat_obj.current_user.pk
+                            pipeline.submit(dict(m, thread_id=thread_id, is_me=is_me))
+                        if json_mode():
+                            emit('message', thread_id=thread_id, **m)
+                            continue
                         ts = m.get('timestamp') or ''
                         user_id = m.get('user_id')
                         # Prefer friendly name: 'You' or conversation display name
                         sender_label = 'You' if user_id == chat_obj.current_user.pk else selected_conv.get('display_name', 'User')
                         click.echo(f"{Fore.YELLOW}[{ts}] {sender_label}: {m.get('text')}{Style.RESET_ALL}")
                     last_seen = new[-1]['id']
+                primed = True
             except Exception as e:
-                click.echo(f"{Fore.RED}Polling error: {e}{Style.RESET_ALL}")
+                if json_mode():
+                    emit('error', action='poll', message=str(e))
+                else:
+                    click.echo(f"{Fore.RED}Polling error: {e}{Style.RESET_ALL}")
             time.sleep(poll_interval)
 
+    pipeline.start()
     poller = threading.Thread(target=poll_thread_messages, args=(selected_conv['thread_id'], chat, stop_event))
     poller.daemon = True
     poller.start()
 
     # Interactive mode
-    click.echo(f"\n{Fore.YELLOW}💬 Type your message and press Enter (or 'quit' to exit):{Style.RESET_ALL}")
+    echo(f"\n{Fore.YELLOW}💬 Type your message and press Enter (or 'quit' to exit):{Style.RESET_ALL}")
     try:
         while True:
             try:
-                message = click.prompt('>', prompt_suffix=' ', show_default=False)
+                message = click.prompt('>', prompt_suffix=' ', show_default=False, err=json_mode())
                 if message.lower() in ['quit', 'exit', 'q']:
                     break
                 if message.strip():
-                    if chat.send_message(selected_conv['thread_id'], message):
+                    if chat.send_message(selected_conv['thread_id'], message) and not json_mode():
                         click.echo(f"{Fore.GREEN}[You]: {message}{Style.RESET_ALL}")
             except (KeyboardInterrupt, EOFError):
                 break
@@ -144,7 +233,10 @@ def chat_cmd(conversation_id, limit):
         # Cleanly stop the poller thread
         stop_event.set()
         poller.join(timeout=1)
-        click.echo(f"\n{Fore.CYAN}👋 Goodbye!{Style.RESET_ALL}")
+        if pipeline.hooks:
+            pipeline.stop()
+            print_hook_metrics(pipeline.metrics())
+        echo(f"\n{Fore.CYAN}👋 Goodbye!{Style.RESET_ALL}")
 
 @cli.command()
 @click.argument('username')
@@ -154,12 +246,16 @@ def send(username, message):
     auth = InstagramAuth()
     
     if not auth.authenticate():
-        click.echo(f"{Fore.RED}❌ Authentication failed. Please run 'login' command first.{Style.RESET_ALL}")
-        sys.exit(1)
+        auth_failed()
     
     chat = InstagramChat(auth.get_client())
     message_text = ' '.join(message)
     
+    if json_mode():
+        if not chat.send_message(username, message_text):
+            sys.exit(1)
+        return
+
     click.echo(f"📤 Sending message to @{username}: {message_text}")
     
     if chat.send_message(username, message_text):
@@ -174,13 +270,12 @@ def search(query):
     auth = InstagramAuth()
     
     if not auth.authenticate():
-        click.echo(f"{Fore.RED}❌ Authentication failed. Please run 'login' command first.{Style.RESET_ALL}")
-        sys.exit(1)
+        auth_failed()
     
     chat = InstagramChat(auth.get_client())
     users = chat.search_users(query)
     
-    if users:
+    if users and not json_mode():
         click.echo(f"\n{Fore.GREEN}💡 Use 'send <username> <message>' to send a message{Style.RESET_ALL}")
 
 @cli.command()
@@ -190,18 +285,24 @@ def status():
     
     if auth.load_session() and auth.verify_login():
         user_info = auth.get_client().account_info()
+        if json_mode():
+            emit('status', authenticated=True, username=user_info.username, full_name=user_info.full_name,
+                 follower_count=user_info.follower_count, following_count=user_info.following_count)
+            return
         click.echo(f"{Fore.GREEN}✅ Authenticated as: @{user_info.username}{Style.RESET_ALL}")
         click.echo(f"   Full name: {user_info.full_name}")
         click.echo(f"   Followers: {user_info.follower_count}")
         click.echo(f"   Following: {user_info.following_count}")
+    elif json_mode():
+        emit('status', authenticated=False)
     else:
         click.echo(f"{Fore.RED}❌ Not authenticated. Please run 'login' command.{Style.RESET_ALL}")
 
 @cli.command()
 def setup():
     """Setup wizard for first-time configuration."""
-    click.echo(f"{Fore.CYAN}🚀 Instagram CLI Chat Setup Wizard{Style.RESET_ALL}")
-    click.echo("=" * 40)
+    echo(f"{Fore.CYAN}🚀 Instagram CLI Chat Setup Wizard{Style.RESET_ALL}")
+    echo("=" * 40)
     
     # Check if .env file exists
     env_file = ".env"
@@ -215,18 +316,17 @@ def setup():
         pass
     
     if env_exists:
-        click.echo(f"{Fore.YELLOW}⚠️  Configuration file already exists{Style.RESET_ALL}")
-        if not click.confirm("Do you want to reconfigure?"):
+        echo(f"{Fore.YELLOW}⚠️  Configuration file already exists{Style.RESET_ALL}")
+        if not click.confirm("Do you want to reconfigure?", err=json_mode()):
             return
     
-    click.echo(f"\n{Fore.BLUE}📝 Please enter your Instagram credentials:{Style.RESET_ALL}")
-    username = click.prompt('Instagram username')
-    password = click.prompt('Instagram password', hide_input=True)
+    echo(f"\n{Fore.BLUE}📝 Please enter your Instagram credentials:{Style.RESET_ALL}")
+    username = click.prompt('Instagram username', err=json_mode())
+    password = click.prompt('Instagram password', hide_input=True, err=json_mode())
     
-    # Create .env file
+    # Create .env file; the password goes to the keyring instead
     env_content = f"""# Instagram CLI Chat Configuration
 INSTAGRAM_USERNAME={username}
-INSTAGRAM_PASSWORD={password}
 
 # Optional settings
 MAX_MESSAGES_DISPLAY=10
@@ -236,27 +336,34 @@ POLLING_INTERVAL=5
     with open(env_file, 'w') as f:
         f.write(env_content)
     
-    click.echo(f"\n{Fore.GREEN}✅ Configuration saved to .env file{Style.RESET_ALL}")
-    click.echo(f"{Fore.YELLOW}⚠️  Keep your .env file secure and don't share it!{Style.RESET_ALL}")
+    echo(f"\n{Fore.GREEN}✅ Configuration saved to .env file{Style.RESET_ALL}")
     
     # Test login
-    click.echo(f"\n{Fore.BLUE}🔐 Testing login...{Style.RESET_ALL}")
+    echo(f"\n{Fore.BLUE}🔐 Testing login...{Style.RESET_ALL}")
     auth = InstagramAuth()
-    if auth.login(username, password):
-        click.echo(f"\n{Fore.GREEN}🎉 Setup completed successfully!{Style.RESET_ALL}")
-        click.echo(f"\n{Fore.CYAN}Next steps:{Style.RESET_ALL}")
-        click.echo("  • Run 'instagram-chat conversations' to see your chats")
-        click.echo("  • Run 'instagram-chat send <username> <message>' to send a message")
-        click.echo("  • Run 'instagram-chat --help' for more commands")
+    logged_in = auth.login(username, password)
+    if json_mode():
+        emit('login', username=username, ok=logged_in)
+    if logged_in:
+        # Only keep the password once it is known to work
+        auth.save_password(username, password)
+        echo(f"\n{Fore.GREEN}🎉 Setup completed successfully!{Style.RESET_ALL}")
+        echo(f"\n{Fore.CYAN}Next steps:{Style.RESET_ALL}")
+        echo("  • Run 'instagram-chat conversations' to see your chats")
+        echo("  • Run 'instagram-chat send <username> <message>' to send a message")
+        echo("  • Run 'instagram-chat --help' for more commands")
     else:
-        click.echo(f"\n{Fore.RED}❌ Setup failed. Please check your credentials.{Style.RESET_ALL}")
+        echo(f"\n{Fore.RED}❌ Setup failed. Please check your credentials.{Style.RESET_ALL}")
 
 if __name__ == '__main__':
     try:
         cli()
     except KeyboardInterrupt:
-        click.echo(f"\n{Fore.YELLOW}👋 Interrupted by user{Style.RESET_ALL}")
+        echo(f"\n{Fore.YELLOW}👋 Interrupted by user{Style.RESET_ALL}")
         sys.exit(0)
     except Exception as e:
-        click.echo(f"\n{Fore.RED}❌ Unexpected error: {e}{Style.RESET_ALL}")
+        if json_mode():
+            emit('error', action='unexpected', message=str(e))
+        else:
+            click.echo(f"\n{Fore.RED}❌ Unexpected error: {e}{Style.RESET_ALL}")
         sys.exit(1)
\ No newline at end of file
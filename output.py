@@ -0,0 +1,46 @@
+"""Output helpers for Instagram CLI Chat.
+
+By default commands print colored, human-readable text. When JSON mode is
+enabled (the global ``--json`` flag) they instead write one compact JSON
+event per line (NDJSON) to stdout, and any remaining status text is sent
+to stderr so that stdout stays machine-readable.
+"""
+import threading
+import click
+from serializer import dumps
+
+_json_mode = False
+_write_lock = threading.Lock()
+
+
+def set_json_mode(enabled):
+    """Enable or disable NDJSON event output."""
+    global _json_mode
+    _json_mode = bool(enabled)
+
+
+def json_mode():
+    """Return True if NDJSON event output is enabled."""
+    return _json_mode
+
+
+def emit(event, **fields):
+    """Write a single JSON event line to stdout and flush it immediately.
+
+    The poller thread and the input loop may emit concurrently, so writes
+    are serialized to keep every line intact.
+    """
+    record = {'event': event}
+    record.update(fields)
+    line = dumps(record) + b'\n'
+    stream = click.get_binary_stream('stdout')
+    with _write_lock:
+        stream.write(line)
+        stream.flush()
+
+
+def echo(message=None, **kwargs):
+    """Echo human-readable status text, diverted to stderr in JSON mode."""
+    if _json_mode:
+        kwargs['err'] = True
+    click.echo(message, **kwargs)
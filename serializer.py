@@ -0,0 +1,26 @@
+"""Fast JSON encoding helpers for Instagram CLI Chat."""
+import json
+
+try:
+    import orjson
+except ImportError:  # safety net if orjson is unavailable; use the stdlib encoder
+    orjson = None
+
+
+def dumps(obj, sort_keys=False):
+    """Serialize an object to compact UTF-8 encoded JSON bytes.
+
+    With sort_keys the output is canonical, so equal objects encode to equal
+    bytes and can be compared without decoding.
+    """
+    if orjson is not None:
+        return orjson.dumps(obj, default=str, option=orjson.OPT_SORT_KEYS if sort_keys else None)
+    return json.dumps(obj, separators=(',', ':'), ensure_ascii=False, sort_keys=sort_keys,
+                      default=str).encode('utf-8')
+
+
+def loads(data):
+    """Deserialize JSON from bytes or str."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
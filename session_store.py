@@ -0,0 +1,170 @@
+"""Session and credential storage for Instagram CLI Chat.
+
+Session settings are kept in a compact JSON file that is written atomically
+and only when its contents actually change. The file contents are cached in
+memory, so long-running or batch use only reads the disk again when the file
+is modified. Each load decodes a fresh dict from the cached bytes.
+
+Passwords are kept in the system keyring. On machines without one (servers,
+containers) a file-backed keyring is used instead.
+"""
+import os
+import tempfile
+import threading
+from pathlib import Path
+import keyring
+from keyring.backends import fail
+from keyring.errors import PasswordDeleteError
+from config import Config
+from serializer import dumps, loads
+
+KEYRING_SERVICE = 'instagram-cli-chat'
+
+# path -> {'signature': (mtime_ns, size), 'data': bytes}
+_cache = {}
+_cache_lock = threading.Lock()
+
+
+def atomic_write(path, data):
+    """Write bytes to path atomically with owner-only permissions.
+
+    The data goes to a temporary file in the same directory which is synced
+    and then renamed over the target, so readers never see a partial file.
+    """
+    path = Path(path)
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+class SessionStore:
+    """Load and save instagrapi session settings."""
+
+    def __init__(self, path=None):
+        self.path = Path(path or Config.SESSION_FILE)
+
+    def load(self):
+        """Return the stored settings, or None if no session has been saved."""
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+        signature = (stat.st_mtime_ns, stat.st_size)
+
+        with _cache_lock:
+            entry = _cache.get(self.path)
+        if entry and entry['signature'] == signature:
+            data = entry['data']
+        else:
+            data = self.path.read_bytes()
+            with _cache_lock:
+                _cache[self.path] = {'signature': signature, 'data': data}
+        # instagrapi keeps the dict it is given, nested dicts included, and
+        # changes it; decoding every time means no caller shares state
+        return loads(data)
+
+    def save(self, settings):
+        """Save settings if they differ from what is stored.
+
+        Returns True if the file was written, False if it was already up to date.
+        """
+        data = dumps(settings, sort_keys=True)
+        if data == self._stored_data():
+            return False
+
+        atomic_write(self.path, data)
+        stat = os.stat(self.path)
+        with _cache_lock:
+            _cache[self.path] = {'signature': (stat.st_mtime_ns, stat.st_size), 'data': data}
+        return True
+
+    def invalidate(self):
+        """Drop any cached copy of this session."""
+        with _cache_lock:
+            _cache.pop(self.path, None)
+
+    def _stored_data(self):
+        """Return the encoded settings currently on disk, or None."""
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+        with _cache_lock:
+            entry = _cache.get(self.path)
+            if entry and entry['signature'] == (stat.st_mtime_ns, stat.st_size):
+                return entry['data']
+        return self.path.read_bytes()
+
+
+class FileKeyring:
+    """Password store with the keyring get/set/delete interface, kept in a file.
+
+    Meant for headless machines without a system keyring. It is created
+    directly by get_keyring() rather than registered with keyring. The file
+    is only protected by its owner-only permissions, not encrypted.
+    """
+
+    name = 'file keyring'
+
+    def __init__(self, path=None):
+        self.path = Path(path or Config.KEYRING_FILE)
+        self._lock = threading.Lock()
+
+    def get_password(self, service, username):
+        return self._read().get(service, {}).get(username)
+
+    def set_password(self, service, username, password):
+        with self._lock:
+            data = self._read()
+            data.setdefault(service, {})[username] = password
+            atomic_write(self.path, dumps(data, sort_keys=True))
+
+    def delete_password(self, service, username):
+        with self._lock:
+            data = self._read()
+            if username not in data.get(service, {}):
+                raise PasswordDeleteError("Password not found")
+            del data[service][username]
+            atomic_write(self.path, dumps(data, sort_keys=True))
+
+    def _read(self):
+        try:
+            return loads(self.path.read_bytes())
+        except FileNotFoundError:
+            return {}
+
+
+def get_keyring():
+    """Return the keyring backend to store credentials in.
+
+    CREDENTIAL_STORE=file forces the file keyring; otherwise the system
+    keyring is used when one is available.
+    """
+    if Config.CREDENTIAL_STORE == 'file':
+        return FileKeyring()
+    backend = keyring.get_keyring()
+    if isinstance(backend, fail.Keyring):
+        return FileKeyring()
+    return backend
+
+
+def get_password(username):
+    """Return the stored password for username, or None."""
+    return get_keyring().get_password(KEYRING_SERVICE, username)
+
+
+def set_password(username, password):
+    """Store the password for username; return the backend used."""
+    backend = get_keyring()
+    backend.set_password(KEYRING_SERVICE, username, password)
+    return backend